@@ -4,44 +4,80 @@ from crewai.project import CrewBase, agent, crew, task
 from rpgagents.tools.game_search_tool import GameSearchTool
 from rpgagents.tools.web_search_tool import WebSearchTool
 from typing import List
+import copy
+import functools
 import os
 import logging
+import traceback
+import yaml
 
-logging.basicConfig(level=logging.INFO)
+
+class _TruncatedTracebackFormatter(logging.Formatter):
+    """Formatter that keeps only the innermost frames of logged tracebacks"""
+
+    max_frames = 5
+
+    def formatException(self, ei) -> str:
+        return "".join(traceback.format_exception(*ei, limit=-self.max_frames)).rstrip("\n")
+
+
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(_TruncatedTracebackFormatter(logging.BASIC_FORMAT))
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
 from dotenv import load_dotenv
 load_dotenv()
 
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Construct absolute paths to config files
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config')
+AGENTS_CONFIG_PATH = os.path.join(CONFIG_DIR, 'agents.yaml')
+TASKS_CONFIG_PATH = os.path.join(CONFIG_DIR, 'tasks.yaml')
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_yaml(path: str, mtime: float) -> dict:
+    """Parse a YAML config file straight from its file handle (cached per file version)."""
+    # Binary handle: the loader detects and decodes UTF-8 itself (inline in libyaml)
+    with open(path, 'rb') as f:
+        content = yaml.load(f, Loader=_YAML_LOADER)
+    return content if isinstance(content, dict) else {}
+
+
+def _load_yaml(path) -> dict:
+    """Return a private copy of a parsed config; the file is only re-parsed when its mtime changes."""
+    path = os.path.abspath(os.fspath(path))
+    # CrewBase rewrites agent/task entries in place, so never hand out the cached dict itself
+    return copy.deepcopy(_parse_yaml(path, os.path.getmtime(path)))
+
 
 @CrewBase
 class Rpgagents:
     """RPG Gaming Assistant - Works with ANY RPG game dynamically"""
 
-    # Construct absolute paths to config files
-    agents_config = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'agents.yaml')
-    tasks_config = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'tasks.yaml')
+    agents_config = AGENTS_CONFIG_PATH
+    tasks_config = TASKS_CONFIG_PATH
 
     # Declare agents and tasks lists (populated by decorators)
     agents: List[Agent] = []
     tasks: List[Task] = []
 
-    def __init__(self, provider: str = "ollama"):
+    def __init__(self, provider: str = "ollama", stream: bool = False):
         # Initialize tools
         self._game_search_tool = GameSearchTool()
         self._web_search_tool = WebSearchTool()
 
         logger.info("✅ Tools initialized: Game Documentation Search, Web Search")
-        
-        # Load configs if they are strings (CrewAI decorator issue workaround)
-        import yaml
-        if isinstance(self.agents_config, str):
-            with open(self.agents_config, 'r', encoding='utf-8') as f:
-                self.agents_config = yaml.safe_load(f)
-        
-        if isinstance(self.tasks_config, str):
-            with open(self.tasks_config, 'r', encoding='utf-8') as f:
-                self.tasks_config = yaml.safe_load(f)
+
+        # When True, kickoff() returns a CrewStreamingOutput that yields tokens as they arrive
+        self._stream = stream
+
+        # Only the hosted API is rate limited; don't make local Ollama calls sleep
+        self._max_rpm = 10 if provider == "gemini" else None
 
         # Get model based on provider
         if provider == "gemini":
@@ -65,11 +101,19 @@ class Rpgagents:
 
             logger.info(f"🤖 Using LLM: ollama/{model_name} at {ollama_host}")
 
+            # Keep the model resident between the researcher and game_expert turns
+            # (and across runs) instead of Ollama's default 5 minute unload
+            keep_alive = os.getenv('OLLAMA_KEEP_ALIVE', '-1')
+            # Ollama reads bare numbers as seconds but rejects unitless numeric strings
+            if keep_alive.lstrip('-').isdigit():
+                keep_alive = int(keep_alive)
+
             self._llm = LLM(
                 model=f"ollama/{model_name}",
                 base_url=ollama_host,
                 temperature=0.3,
                 max_tokens=2048,
+                keep_alive=keep_alive,
             )
 
     @agent
@@ -121,6 +165,11 @@ class Rpgagents:
             verbose=True,
             memory=False,
             cache=False,
-            max_rpm=10,
+            max_rpm=self._max_rpm,
+            stream=self._stream,
         )
 
+
+# CrewBase re-reads both configs after __init__ through its injected
+# `load_yaml`; route that through the C loader as well.
+Rpgagents.load_yaml = staticmethod(_load_yaml)
@@ -2,12 +2,14 @@
 import sys
 import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
-from rpgagents.crew import Rpgagents
+# The crew (and chromadb / sentence-transformers behind its tools) is imported
+# inside each command so `python -m rpgagents.main` reaches the prompt quickly
 
 
 
@@ -21,6 +23,7 @@ def determine_provider_and_search(game_name: str, query: str):
     
     # This acts as the "Pre-Check" and also the "Ingestion" step
     # If it goes to web, it indexes the data NOW.
+    # The result is memoized briefly, so the researcher's identical tool call reuses it.
     search_result = pre_search_tool._run(game_name, query)
     
     if "Web Index" in search_result:
@@ -73,6 +76,10 @@ def run():
     }
 
     try:
+        # Imported here rather than at module load; also sets up logging for the pre-search
+        from crewai.types.streaming import StreamChunkType
+        from rpgagents.crew import Rpgagents
+
         # --- SMART PROVIDER SWITCHING ---
         # 1. Perform a pre-search to determine if data is local or requires web
         print(f"\n🔍 Checking knowledge base for query...")
@@ -94,14 +101,26 @@ def run():
         # 2. Kickoff Crew with selected provider
         inputs['provider'] = provider 
         
-        result = Rpgagents(provider=provider).crew().kickoff(inputs=inputs)
-        result_text = result.raw if hasattr(result, 'raw') else str(result)
-                         
+        # The guide depends on the full research output, so the agents still run in
+        # sequence, but the guide is streamed to the terminal as it is written
+        crew = Rpgagents(provider=provider, stream=True).crew()
+        streaming = crew.kickoff(inputs=inputs)
+        guide_task_index = len(crew.tasks) - 1
+
         print("\n" + "=" * 70)
         print("📖 YOUR GAME GUIDE")
         print("=" * 70)
-        print(result_text)
-        print("=" * 70)
+        streamed = False
+        for chunk in streaming:
+            if chunk.task_index == guide_task_index and chunk.chunk_type == StreamChunkType.TEXT:
+                print(chunk.content, end="", flush=True)
+                streamed = True
+
+        result = streaming.result
+        result_text = result.raw if hasattr(result, 'raw') else str(result)
+        if not streamed:
+            print(result_text, end="")
+        print("\n" + "=" * 70)
 
         # Save to file in root 'output' folder
         # Determine path helper: src/rpgagents/main.py -> backend/rpgagents/output
@@ -127,15 +146,17 @@ def run():
         return 1
 
 
-def quick_search(game_name: str, query: str):
+def quick_search(game_name: str, query: str, provider: str = "ollama"):
     """Programmatic search - for API/script usage"""
+    from rpgagents.crew import Rpgagents
+
     inputs = {
         'game_name': game_name,
         'query': query,
         'current_year': str(datetime.now().year)
     }
 
-    result = Rpgagents().crew().kickoff(inputs=inputs)
+    result = Rpgagents(provider=provider).crew().kickoff(inputs=inputs)
     return result.raw if hasattr(result, 'raw') else str(result)
 
 
@@ -147,6 +168,7 @@ def train():
         'current_year': str(datetime.now().year)
     }
     try:
+        from rpgagents.crew import Rpgagents
         Rpgagents().crew().train(
             n_iterations=int(sys.argv[1]),
             filename=sys.argv[2],
@@ -161,6 +183,7 @@ def train():
 def replay():
     """Replay the crew execution from a specific task."""
     try:
+        from rpgagents.crew import Rpgagents
         Rpgagents().crew().replay(task_id=sys.argv[1])
         return 0
     except Exception as e:
@@ -168,7 +191,7 @@ def replay():
         return 1
 
 
-def test():
+def test(provider: str = "ollama"):
     """Test the crew with sample queries."""
     test_cases = [
         ("Hollow Knight", "Where to find Mantis Claw"),
@@ -178,14 +201,24 @@ def test():
 
     print("🧪 Running test cases...\n")
 
-    for game, query in test_cases:
-        print(f"Testing: {game} - {query}")
-        try:
-            result = quick_search(game, query)
-            print(f"✅ Success - {len(result)} characters")
-        except Exception as e:
-            print(f"❌ Failed: {e}")
-        print("-" * 50)
+    # Cases are independent, so run them concurrently; a local Ollama server
+    # serves one model at a time, so keep those sequential
+    max_workers = 1 if provider == "ollama" else len(test_cases)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(quick_search, game, query, provider): (game, query)
+            for game, query in test_cases
+        }
+        for future in as_completed(futures):
+            game, query = futures[future]
+            print(f"Testing: {game} - {query}")
+            try:
+                result = future.result()
+                print(f"✅ Success - {len(result)} characters")
+            except Exception as e:
+                print(f"❌ Failed: {e}")
+            print("-" * 50)
 
     return 0
 
@@ -1,12 +1,248 @@
 """Local game documentation search tool with optional caching"""
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, PrivateAttr
-import chromadb
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
 import os
 import logging
+import re
+import threading
+import time
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Process-wide ChromaDB clients (one per DB path) and embedding model, shared by
+# every GameSearchTool so the MiniLM model is only loaded once per process.
+_client_lock = threading.Lock()
+_chroma_clients: dict = {}
+_embedder_lock = threading.Lock()
+_embedder_future: Future | None = None
+
+# Background workers: one loads the embedding model, the others run web fetches
+# that overlap with it (see GameSearchTool._run)
+_embedder_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedder")
+_web_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="web-search")
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = 64
+# Pre-quantized int8 export shipped in the MiniLM model repo (AVX512-VNNI kernels)
+EMBEDDING_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def _get_client():
+    """Return the shared ChromaDB client for the configured DB path"""
+    # chromadb is imported on first use rather than when the tool module loads
+    import chromadb
+
+    db_path = os.path.abspath(os.getenv("CHROMA_DB_PATH", "./chroma_db"))
+    with _client_lock:
+        client = _chroma_clients.get(db_path)
+        if client is None:
+            client = chromadb.PersistentClient(path=db_path)
+            _chroma_clients[db_path] = client
+        return client
+
+
+def _load_embedder():
+    """Load the embedding function (None if unavailable)"""
+    # Using sentence-transformers for local, free embeddings
+    try:
+        from chromadb.utils import embedding_functions
+    except Exception as e:
+        logger.warning(f"Failed to load embeddings: {e}")
+        return None
+
+    # EMBEDDING_BACKEND=onnx-int8 runs the quantized ONNX export of MiniLM
+    # (needs `sentence-transformers[onnx]`), falling back to the FP32 model
+    if os.getenv("EMBEDDING_BACKEND", "torch").lower() == "onnx-int8":
+        try:
+            embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=EMBEDDING_MODEL,
+                normalize_embeddings=True,
+                backend="onnx",
+                model_kwargs={"file_name": EMBEDDING_INT8_FILE},
+            )
+            logger.info("Using int8 ONNX embeddings")
+            return embedder
+        except Exception as e:
+            logger.warning(f"Failed to load int8 embeddings, using FP32 model: {e}")
+
+    try:
+        return embedding_functions.SentenceTransformerEmbeddingFunction(
+            model_name=EMBEDDING_MODEL,
+            normalize_embeddings=True,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load embeddings: {e}")
+        return None
+
+
+def _warm_embedder() -> Future:
+    """Start loading the shared embedding function in the background (no-op if already started)"""
+    global _embedder_future
+    with _embedder_lock:
+        if _embedder_future is None:
+            _embedder_future = _embedder_executor.submit(_load_embedder)
+        return _embedder_future
+
+
+def _get_embedder():
+    """Return the shared embedding function, waiting for it to load (None if unavailable)"""
+    global _embedder_future
+    future = _warm_embedder()
+    embedder = future.result()
+    if embedder is None:
+        # Don't cache a failed load; the next tool retries
+        with _embedder_lock:
+            if _embedder_future is future:
+                _embedder_future = None
+    return embedder
+
+
+def _encode_documents(embedder, texts: list[str]):
+    """Embed texts in one batched call on the embedder's model (None lets Chroma embed them itself)"""
+    model = getattr(embedder, "_model", None)
+    if model is None:
+        return None
+    return model.encode(
+        texts,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+
+
+_NORMALIZE_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+
+def _normalize_game_id(name: str) -> str:
+    """Map a game name to its collection id (lowercase, spaces/hyphens -> underscores)"""
+    return name.lower().translate(_NORMALIZE_TABLE)
+
+
+def _top_k_chunks(chunk_embeddings: np.ndarray, query_embedding: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k chunks closest to the query, best first (embeddings are unit-normalized)"""
+    scores = chunk_embeddings @ query_embedding
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def _format_results(label: str, default_source: str, documents: list[str], metadatas: list[dict]) -> str:
+    """Render search hits as '**[<label> i: source]**' blocks separated by rules"""
+    return "\n---\n".join(
+        f"**[{label} {i}: {metadata.get('source', default_source)}]**\n{doc}\n"
+        for i, (doc, metadata) in enumerate(zip(documents, metadatas), 1)
+    )
+
+
+# 400 chars allows isolating specific items/paragraphs better than 1000.
+CHUNK_SIZE = 400
+CHUNK_OVERLAP = 50
+# Natural chunk boundaries: line breaks (extracted wiki text has one paragraph per
+# line) and whitespace after sentence-ending punctuation
+_SPLIT_RE = re.compile(r'\n+|(?<=[.!?])\s+')
+
+
+def _word_windows(text: str, start: int, end: int, size: int, overlap: int) -> list[tuple[int, int]]:
+    """Spans covering text[start:end] in windows of at most `size` chars, cut at
+    whitespace where possible and restarting at a word within `overlap` chars of the cut"""
+    spans = []
+    while end - start > size:
+        limit = start + size
+        cut = max(text.rfind(' ', start + 1, limit + 1), text.rfind('\t', start + 1, limit + 1))
+        if cut <= start:
+            # One unbroken run of characters: fall back to fixed windows
+            spans.append((start, limit))
+            start += size - overlap
+        else:
+            piece_end = cut
+            while text[piece_end - 1] in ' \t':
+                piece_end -= 1
+            spans.append((start, piece_end))
+            start = max(piece_end - overlap, start + 1)
+            while start < cut and not (text[start - 1] in ' \t' and text[start] not in ' \t'):
+                start += 1
+        while text[start] in ' \t':
+            start += 1
+    spans.append((start, end))
+    return spans
+
+
+def _chunk(text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split text into chunks of at most `size` chars on natural boundaries.
+
+    Consecutive segments are packed into a window; when the next segment doesn't
+    fit, the window is emitted and its trailing segments (up to `overlap` chars)
+    are carried into the next chunk. Segments longer than `size` are cut at word
+    boundaries into windows overlapping by up to `overlap` chars. Chunks never
+    start or end with whitespace, and blank segments are dropped.
+    """
+    # (start, end) spans of the text between boundaries, in a single regex scan
+    pieces = []
+    pos = 0
+    for start, end in [*((m.start(), m.end()) for m in _SPLIT_RE.finditer(text)), (len(text), len(text))]:
+        segment = text[pos:start]
+        seg_start = pos + len(segment) - len(segment.lstrip())
+        seg_end = start - (len(segment) - len(segment.rstrip()))
+        pos = end
+        if seg_end <= seg_start:
+            continue
+        pieces.extend(_word_windows(text, seg_start, seg_end, size, overlap))
+
+    chunks = []
+    first = 0
+    for i, (_, end) in enumerate(pieces):
+        if i > first and end - pieces[first][0] > size:
+            chunks.append(text[pieces[first][0]:pieces[i - 1][1]])
+            # Keep up to `overlap` chars of trailing context, as long as the new piece still fits
+            first = i
+            while first > 0 and pieces[i - 1][1] - pieces[first - 1][0] <= overlap \
+                    and end - pieces[first - 1][0] <= size:
+                first -= 1
+    if pieces:
+        chunks.append(text[pieces[first][0]:pieces[-1][1]])
+    return chunks
+
+
+# Short-lived memo of formatted search results. main.determine_provider_and_search
+# runs the same (game, query) search the researcher agent issues right after it,
+# so the second call is answered from here instead of ChromaDB / the web.
+RECENT_RESULTS_TTL = 60.0
+_recent_lock = threading.Lock()
+_RECENT_RESULTS: dict[tuple[str, bytes], tuple[float, str]] = {}
+
+
+def _recent_key(normalized_game_id: str, query: str) -> tuple[str, bytes]:
+    digest = hashlib.blake2b(f"{normalized_game_id}|{query}".encode(), digest_size=16).digest()
+    return normalized_game_id, digest
+
+
+def _get_recent(key: tuple[str, bytes]) -> str | None:
+    """Return a cached result for key if it is still fresh"""
+    with _recent_lock:
+        entry = _RECENT_RESULTS.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > RECENT_RESULTS_TTL:
+            del _RECENT_RESULTS[key]
+            return None
+        return entry[1]
+
+
+def _remember(key: tuple[str, bytes], result: str) -> str:
+    """Store a result for key and return it unchanged"""
+    now = time.monotonic()
+    with _recent_lock:
+        # Drop expired entries so long-running processes don't accumulate results
+        for stale in [k for k, (ts, _) in _RECENT_RESULTS.items() if now - ts > RECENT_RESULTS_TTL]:
+            del _RECENT_RESULTS[stale]
+        _RECENT_RESULTS[key] = (now, result)
+    return result
+
+
 class GameSearchInput(BaseModel):
     game_name: str = Field(description="Full game name (e.g., 'Hollow Knight', 'Elden Ring')")
     query: str = Field(description="Search query about game mechanics, items, locations, etc.")
@@ -21,43 +257,85 @@ class GameSearchTool(BaseTool):
     )
     args_schema: type[BaseModel] = GameSearchInput
 
-    _chroma_client: chromadb.PersistentClient = PrivateAttr()
-    _embeddings: object = PrivateAttr()
+    _chroma_client: object = PrivateAttr()
+    _embeddings: object = PrivateAttr(default=None)
+    _embeddings_loaded: bool = PrivateAttr(default=False)
+    _collection_cache: dict = PrivateAttr(default_factory=dict)
 
     def __init__(self, **data):
         super().__init__(**data)
 
-        # Initialize ChromaDB
-        db_path = os.getenv("CHROMA_DB_PATH", "./chroma_db")
-        self._chroma_client = chromadb.PersistentClient(path=db_path)
+        # Reuse the process-wide ChromaDB client; the shared embedding model is
+        # only loaded once a search needs it
+        self._chroma_client = _get_client()
+
+    def _embedding_function(self):
+        """Return the shared embedding function, waiting for the background load if needed"""
+        if not self._embeddings_loaded:
+            self._embeddings = _get_embedder()
+            self._embeddings_loaded = True
+        return self._embeddings
 
-        # Initialize embeddings (using sentence-transformers for local, free embeddings)
+    def _has_collection(self, collection_name: str) -> bool:
+        """Check whether a collection exists without waiting for the embedding model"""
+        if collection_name in self._collection_cache:
+            return True
+        from chromadb.errors import NotFoundError
         try:
-            from chromadb.utils import embedding_functions
-            self._embeddings = embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name="all-MiniLM-L6-v2"
-            )
-        except Exception as e:
-            logger.warning(f"Failed to load embeddings: {e}")
-            self._embeddings = None
+            self._chroma_client.get_collection(name=collection_name, embedding_function=None)
+        except NotFoundError:
+            return False
+        return True
+
+    def _get_collection(self, collection_name: str):
+        """Return a cached collection handle, or None if the collection doesn't exist yet"""
+        collection = self._collection_cache.get(collection_name)
+        if collection is None:
+            from chromadb.errors import NotFoundError
+            try:
+                collection = self._chroma_client.get_collection(
+                    name=collection_name,
+                    embedding_function=self._embedding_function()
+                )
+            except NotFoundError:
+                return None
+            self._collection_cache[collection_name] = collection
+        return collection
+
+    @staticmethod
+    def _search_web(game_name: str, query: str) -> list[dict]:
+        """Fetch raw web results for indexing, reusing a persisted scrape when one is fresh"""
+        from rpgagents.tools.web_cache import WebSearchCache
+        from rpgagents.tools.web_search_tool import WebSearchTool
+
+        cache = WebSearchCache()
+        game_key = _normalize_game_id(game_name)
+        cached = cache.get(game_key, query)
+        if cached is not None:
+            logger.info(f"Using cached web results for '{game_name}'")
+            return cached
+
+        results = WebSearchTool().search(game_name, query)
+        if results:
+            cache.put(game_key, query, results)
+        return results
 
     def _run(self, game_name: str, query: str) -> str:
         """Search indexed game documentation"""
         try:
             # Normalize to get game_id
             game_id = game_name
-            normalized_game_id = game_id.lower().replace(" ", "_").replace("-", "_")
+            normalized_game_id = _normalize_game_id(game_id)
             collection_name = f"game_{normalized_game_id}"
 
-            # Check if collection exists
-            existing_collections = [c.name for c in self._chroma_client.list_collections()]
-            
+            recent_key = _recent_key(normalized_game_id, query)
+            cached = _get_recent(recent_key)
+            if cached is not None:
+                logger.info(f"Reusing recent search result for '{game_id}'")
+                return cached
+
             # Helper to perform the search
-            def perform_search(coll_name):
-                 collection = self._chroma_client.get_collection(
-                    name=coll_name,
-                    embedding_function=self._embeddings
-                )
+            def perform_search(collection):
                  result = collection.query(
                     query_texts=[query],
                     n_results=5,
@@ -67,8 +345,19 @@ class GameSearchTool(BaseTool):
                      logger.info(f"🔍 Search Distances: {result['distances'][0]}")
                  return result
 
-            if collection_name in existing_collections:
-                results = perform_search(collection_name)
+            web_future = None
+            collection = None
+            if self._has_collection(collection_name):
+                collection = self._get_collection(collection_name)
+            else:
+                # Nothing indexed for this game yet: load the embedding model in the
+                # background while the web fetch that indexing waits on runs
+                _warm_embedder()
+                logger.info(f"Checking web for '{game_id}'...")
+                web_future = _web_executor.submit(self._search_web, game_id, query)
+
+            if collection is not None:
+                results = perform_search(collection)
                 
                 # Lower distance = better match.
                 # Threshold lowered to 0.45 to be stricter. 0.5-0.6 range was capturing loose matches.
@@ -79,22 +368,21 @@ class GameSearchTool(BaseTool):
                     # Fall through to web search logic
                 elif results['documents'] and results['documents'][0]:
                     # If we have good results, return them
-                    formatted = []
-                    for i, (doc, metadata) in enumerate(zip(results['documents'][0], results['metadatas'][0]), 1):
-                        source = metadata.get('source', 'Local Cache')
-                        formatted.append(f"**[Local Source {i}: {source}]**\n{doc}\n")
-                    return "\n---\n".join(formatted)
+                    return _remember(recent_key, _format_results(
+                        "Local Source", "Local Cache", results['documents'][0], results['metadatas'][0]
+                    ))
 
             # --- Fallback: No local docs or no results found ---
-            # Trigger web search
-            logger.info(f"Checking web for '{game_id}'...")
-            from rpgagents.tools.web_search_tool import WebSearchTool
-            web_tool = WebSearchTool()
-            
+            # Trigger web search (already running if there was no local collection)
             # Use the original game_id (which might be "Hollow Knight") for web search
-            web_results = web_tool.search(game_id, query)
+            if web_future is not None:
+                web_results = web_future.result()
+            else:
+                logger.info(f"Checking web for '{game_id}'...")
+                web_results = self._search_web(game_id, query)
             
             if not web_results:
+                 existing_collections = [c.name for c in self._chroma_client.list_collections()]
                  return (
                     f"No local documentation indexed for '{normalized_game_id}' and web search returned no results. "
                     f"Available games: {', '.join([c.replace('game_', '') for c in existing_collections if c.startswith('game_')])}. "
@@ -105,67 +393,94 @@ class GameSearchTool(BaseTool):
             sources_to_index = [r['href'] for r in web_results]
             
             logger.info(f"Indexing {len(docs_to_index)} new documents for {normalized_game_id}")
-            self.index_documents(normalized_game_id, docs_to_index, sources_to_index)
+            _, indexed = self._index_documents(normalized_game_id, docs_to_index, sources_to_index)
             
-            # Search again
-            # We assume index_documents created the collection
-            results = perform_search(collection_name)
+            if indexed is not None:
+                # Rank the chunks we just embedded in memory instead of a second Chroma query
+                chunks, metadatas, chunk_embeddings = indexed
+                query_embedding = _encode_documents(self._embedding_function(), [query])[0]
+                top = _top_k_chunks(chunk_embeddings, query_embedding, 5)
+                results = {
+                    'documents': [[chunks[i] for i in top]],
+                    'metadatas': [[metadatas[i] for i in top]],
+                }
+            else:
+                # Search again
+                # We assume index_documents created the collection
+                collection = self._get_collection(collection_name)
+                results = perform_search(collection) if collection is not None else None
             
-            if not results['documents'] or not results['documents'][0]:
+            if not results or not results['documents'] or not results['documents'][0]:
                  return "Indexed new content but search yielded no results. This is unexpected."
 
-             # Format results from the new search
-            formatted = []
-            for i, (doc, metadata) in enumerate(zip(results['documents'][0], results['metadatas'][0]), 1):
-                source = metadata.get('source', 'Web Index')
-                formatted.append(f"**[Web Index {i}: {source}]**\n{doc}\n")
-            
-            return "\n---\n".join(formatted)
+            # Format results from the new search
+            return _remember(recent_key, _format_results(
+                "Web Index", "Web Index", results['documents'][0], results['metadatas'][0]
+            ))
 
         except Exception as e:
-            logger.error(f"Local search error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Local search error: {e}")
             return f"Error searching local docs: {str(e)}. Use 'Web Search for Game Information' instead."
 
     def index_documents(self, game_id: str, documents: list[str], sources: list[str]) -> str:
         """Index documents for a game (for caching web results)"""
-        try:
-            from langchain_text_splitters import RecursiveCharacterTextSplitter
+        return self._index_documents(game_id, documents, sources)[0]
 
-            game_id = game_id.lower().replace(" ", "_").replace("-", "_")
+    def _index_documents(self, game_id: str, documents: list[str], sources: list[str]) -> tuple[str, tuple | None]:
+        """Index documents; returns (status, (chunks, metadatas, embeddings) or None)"""
+        try:
+            game_id = _normalize_game_id(game_id)
             collection_name = f"game_{game_id}"
 
             # Get or create collection
             collection = self._chroma_client.get_or_create_collection(
                 name=collection_name,
-                embedding_function=self._embeddings
+                embedding_function=self._embedding_function()
             )
+            self._collection_cache[collection_name] = collection
 
-            # Split documents into chunks. 400 chars allows isolating specific items/paragraphs better than 1000.
-            splitter = RecursiveCharacterTextSplitter(chunk_size=400, chunk_overlap=50)
+            # Split documents into chunks
+            doc_chunks = [(_chunk(doc), source) for doc, source in zip(documents, sources)]
+            total = sum(len(chunks) for chunks, _ in doc_chunks)
 
-            all_chunks = []
-            all_metadatas = []
-            all_ids = []
+            # Preallocate parallel lists and fill by index. IDs are derived from the
+            # chunk content, so re-indexing the same pages overwrites their chunks
+            # (via upsert) instead of piling up copies.
+            all_chunks = [None] * total
+            all_metadatas = [None] * total
+            all_ids = [None] * total
+            seen_ids = set()
 
-            for doc, source in zip(documents, sources):
-                chunks = splitter.split_text(doc)
-                for j, chunk in enumerate(chunks):
-                    all_chunks.append(chunk)
-                    all_metadatas.append({"source": source, "game_id": game_id})
-                    all_ids.append(f"{game_id}_{len(all_ids)}_{j}")
+            k = 0
+            for chunks, source in doc_chunks:
+                metadata = {"source": source, "game_id": game_id}
+                for chunk in chunks:
+                    chunk_id = hashlib.blake2b(f"{source}|{chunk}".encode(), digest_size=16).hexdigest()
+                    # Chroma rejects repeated IDs within one batch
+                    if chunk_id in seen_ids:
+                        continue
+                    seen_ids.add(chunk_id)
+                    all_chunks[k] = chunk
+                    all_metadatas[k] = metadata
+                    all_ids[k] = chunk_id
+                    k += 1
+            del all_chunks[k:], all_metadatas[k:], all_ids[k:]
 
+            indexed = None
             if all_chunks:
-                collection.add(
+                embeddings = _encode_documents(self._embedding_function(), all_chunks)
+                collection.upsert(
                     documents=all_chunks,
+                    embeddings=embeddings,
                     metadatas=all_metadatas,
                     ids=all_ids
                 )
+                if embeddings is not None:
+                    indexed = (all_chunks, all_metadatas, embeddings)
 
-            return f"Indexed {len(all_chunks)} chunks for '{game_id}'"
+            return f"Indexed {len(all_chunks)} chunks for '{game_id}'", indexed
 
         except Exception as e:
             logger.error(f"Indexing error: {e}")
-            return f"Error indexing: {str(e)}"
+            return f"Error indexing: {str(e)}", None
 
@@ -0,0 +1,102 @@
+"""Persistent cache of scraped web search results, keyed by (game, query) fingerprint"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(".websearch_cache", "cache.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+class WebSearchCache:
+    """SQLite-backed store of raw web search results (the scraped docs, not LLM output).
+
+    Entries expire after `ttl` seconds; once the stored results exceed `max_bytes`
+    the oldest rows are evicted. A ttl of 0 disables the cache.
+    """
+
+    def __init__(self, path: str | None = None, ttl: int | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or os.getenv("WEBSEARCH_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else int(os.getenv("WEBSEARCH_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        self.max_bytes = max_bytes
+        self._initialized = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def fingerprint(game_id: str, query: str) -> str:
+        return hashlib.sha256(f"{game_id}|{query}".encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this safe to use from worker threads
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._initialized:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS web_results ("
+                    "fingerprint TEXT PRIMARY KEY, created_at INTEGER, result BLOB)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON web_results(created_at)")
+            self._initialized = True
+        return conn
+
+    def get(self, game_id: str, query: str) -> list[dict] | None:
+        """Return cached results for (game_id, query), or None on a miss or expired entry"""
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT result FROM web_results WHERE fingerprint = ? AND created_at >= ?",
+                    (self.fingerprint(game_id, query), int(time.time()) - self.ttl),
+                ).fetchone()
+            finally:
+                conn.close()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Web cache read failed: {e}")
+            return None
+
+    def put(self, game_id: str, query: str, results: list[dict]) -> None:
+        """Store results for (game_id, query), evicting expired and oldest rows as needed"""
+        if not self.enabled:
+            return
+        now = int(time.time())
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO web_results (fingerprint, created_at, result) VALUES (?, ?, ?)",
+                        (self.fingerprint(game_id, query), now, json.dumps(results).encode()),
+                    )
+                    conn.execute("DELETE FROM web_results WHERE created_at < ?", (now - self.ttl,))
+                    self._evict_oversize(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Web cache write failed: {e}")
+
+    def _evict_oversize(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(result)), 0) FROM web_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for fingerprint, size in conn.execute(
+            "SELECT fingerprint, LENGTH(result) FROM web_results ORDER BY created_at ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            stale.append((fingerprint,))
+            total -= size
+        conn.executemany("DELETE FROM web_results WHERE fingerprint = ?", stale)
@@ -1,11 +1,23 @@
 """Dynamic web search tool for any RPG game"""
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, PrivateAttr
-from bs4 import BeautifulSoup
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+import functools
+import importlib.util
 import os
 import logging
 import re
+import threading
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +38,170 @@ BLOCKED_DOMAINS = [
     'jd.com', 'xiaohongshu.com', 'meituan.com', 'dianping.com'
 ]
 
+# Wiki searched first for known games, keyed by a fragment of the lower-cased,
+# space-free game name (so "Dark Souls 3" still maps to the Dark Souls wiki)
+GAME_SITE_QUERIES = {
+    'hollow': 'site:hollowknight.fandom.com',
+    'elden': 'site:eldenring.wiki.fextralife.com',
+    'darksouls': 'site:darksouls.fandom.com',
+}
+_GAME_SITE_RE = re.compile('|'.join(re.escape(k) for k in GAME_SITE_QUERIES))
+
+# Page chrome removed before any text is extracted
+STRIP_SELECTOR = 'script, style, nav, header, footer, aside, iframe, noscript'
+
+# Per-site extraction: (host domains, content containers in priority order,
+# text-bearing tags, in-article clutter to drop)
+SITE_EXTRACTORS = [
+    (frozenset({'fandom.com', 'wikia.com'}),
+     ('.mw-parser-output', '#mw-content-text', '.page-content', 'article'),
+     ('p', 'li', 'h2', 'h3'),
+     '.portable-infobox, .navbox, .toc, .mbox, .infobox'),
+    (frozenset({'fextralife.com'}),
+     ('#wiki-content-block', '.wiki-content', 'article', '.col-sm-12'),
+     ('p', 'li', 'h2', 'h3', 'td'),
+     ''),
+    (frozenset({'ign.com'}),
+     ('article', '.article-content', '.wiki-page', '.guide-content'),
+     ('p', 'li', 'h2', 'h3'),
+     ''),
+]
+# Containers tried on any site when the site-specific ones come up short
+GENERIC_SELECTORS = ('article', 'main', '.content', '#content', '.post-content')
+
+# Extracted content is capped at a few thousand characters, which the first
+# 64KB of a wiki page's HTML almost always covers
+FETCH_MAX_BYTES = 64 * 1024
+
+# libxml2-backed tree builder; the pure-Python parser is only a fallback
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
 # Characters that indicate non-English content
 NON_ENGLISH_CHARS = re.compile(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af\u0400-\u04ff]')
 
+# Boilerplate left behind by scraped pages, stripped in a single pass
+NOISE_PATTERNS = re.compile('|'.join(f'(?:{p})' for p in [
+    r'JavaScript is disabled.*?browser\.',
+    r'Please enable JavaScript.*?proceed\.',
+    r'A required part.*?different browser\.',
+    r'Client Challenge',
+    r'Loading\.\.\.',
+    r'Sign in.*?account',
+    r'Create.*?account',
+    r'Advertisement',
+    r'Skip to.*?content',
+]), re.IGNORECASE | re.DOTALL)
+
+# Runs of 3+ newlines (collapsed to a paragraph break) or 2+ spaces (to one space)
+_WHITESPACE_RE = re.compile(r'\n{3,}| {2,}')
+
+
+_BLOCKED = frozenset(BLOCKED_DOMAINS)
+_WIKI = frozenset(ENGLISH_WIKI_DOMAINS)
+
+
+def _domain_matches(netloc: str, table: frozenset) -> bool:
+    """Check if a host is, or is a subdomain of, any domain in table"""
+    parts = netloc.split('.')
+    return any('.'.join(parts[i:]) in table for i in range(len(parts)))
+
+
+@functools.lru_cache(maxsize=1)
+def _bs():
+    """BeautifulSoup class, imported on the first HTML parse rather than at module load"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup
+
+
+def _netloc(url: str) -> str:
+    """Lower-cased host of a URL ('' if it can't be parsed)"""
+    try:
+        return urlsplit(url).hostname or ''
+    except ValueError:
+        return ''
+
+
+def _unwrap_redirect(href: str) -> str:
+    """Target URL of a DuckDuckGo '/l/?uddg=...' redirect link (other links unchanged)"""
+    try:
+        target = parse_qs(urlsplit(href).query).get('uddg')
+    except ValueError:
+        return href
+    return target[0] if target else href
+
+
+def _result_netloc(result: dict) -> str:
+    """Host of a search result's URL, parsed once and kept on the result as '_netloc'"""
+    netloc = result.get('_netloc')
+    if netloc is None:
+        netloc = result['_netloc'] = _netloc(result.get('href', ''))
+    return netloc
+
+
+# One pooled HTTP session per process so repeat fetches from the same wiki or
+# search API reuse open keep-alive connections instead of a new TCP+TLS handshake
+_session_lock = threading.Lock()
+_session: requests.Session | None = None
+
+
+def _get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=32,
+                max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept-Language': 'en-US,en;q=0.9',
+            })
+            _session = session
+        return _session
+
+
+# In-process LRU of finished searches, so repeated (game, query) lookups in one
+# session skip the network. WEBSEARCH_MEMORY_CACHE_TTL=0 turns it off.
+SEARCH_CACHE_SIZE = 256
+_search_cache_lock = threading.Lock()
+_search_cache: OrderedDict[tuple[str, str], tuple[float, list[dict]]] = OrderedDict()
+
+
+def _search_cache_ttl() -> float:
+    return float(os.getenv("WEBSEARCH_MEMORY_CACHE_TTL", "3600"))
+
+
+def _get_cached_search(key: tuple[str, str]) -> list[dict] | None:
+    """Return a copy of a fresh cached search result, or None"""
+    ttl = _search_cache_ttl()
+    if ttl <= 0:
+        return None
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > ttl:
+            del _search_cache[key]
+            return None
+        _search_cache.move_to_end(key)
+        return [dict(r) for r in entry[1]]
+
+
+def _cache_search(key: tuple[str, str], results: list[dict]) -> list[dict]:
+    """Remember non-empty results for key and return them unchanged"""
+    if results and _search_cache_ttl() > 0:
+        with _search_cache_lock:
+            _search_cache[key] = (time.monotonic(), [dict(r) for r in results])
+            _search_cache.move_to_end(key)
+            while len(_search_cache) > SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
+    return results
+
 
 class WebSearchInput(BaseModel):
     game_name: str = Field(description="Full game name (e.g., 'Hollow Knight', 'Elden Ring')")
@@ -48,54 +221,55 @@ class WebSearchTool(BaseTool):
     _timeout: int = PrivateAttr(default=10)
     _max_results: int = PrivateAttr(default=10)
     _max_content_length: int = PrivateAttr(default=3000)
-
-    def _is_english_site(self, url: str) -> bool:
-        """Check if URL is from a trusted English gaming site"""
-        url_lower = url.lower()
-        # Block Chinese sites
-        if any(blocked in url_lower for blocked in BLOCKED_DOMAINS):
-            return False
-        # Prefer English wiki sites
-        return any(domain in url_lower for domain in ENGLISH_WIKI_DOMAINS)
+    _session: requests.Session = PrivateAttr(default_factory=_get_session)
 
     def _is_english_content(self, text: str) -> bool:
         """Check if content is primarily in English (not Chinese/Japanese/Korean/Russian)"""
         if not text:
             return False
-        # Count non-English characters
-        non_english_count = len(NON_ENGLISH_CHARS.findall(text))
-        # If more than 10% non-English characters, skip it
-        if len(text) > 0 and (non_english_count / len(text)) > 0.1:
-            return False
+        # None of the flagged scripts are ASCII, so plain-ASCII text skips the scan
+        if text.isascii():
+            return True
+        # If more than 10% non-English characters, skip it; stop counting
+        # as soon as the threshold is crossed
+        threshold = len(text) * 0.1
+        count = 0
+        for _ in NON_ENGLISH_CHARS.finditer(text):
+            count += 1
+            if count > threshold:
+                return False
         return True
 
-    def _filter_english_results(self, results: list) -> list:
-        """Filter results to only include English content"""
-        filtered = []
+    def _classify_result(self, result: dict) -> str | None:
+        """Return 'trusted' (English wiki), 'other', or None for blocked/non-English results"""
+        netloc = _result_netloc(result)
+        # Skip blocked domains
+        if _domain_matches(netloc, _BLOCKED):
+            return None
+        # Skip if title or body contains non-English text
+        if not self._is_english_content(result.get('title', '')) or not self._is_english_content(result.get('body', '')):
+            return None
+        return 'trusted' if _domain_matches(netloc, _WIKI) else 'other'
+
+    def _classify(self, results: list) -> tuple[list, list]:
+        """Split results into (trusted wiki results, other allowed results) in one pass"""
+        trusted, other = [], []
         for r in results:
-            url = r.get('href', '')
-            title = r.get('title', '')
-            body = r.get('body', '')
-
-            # Skip blocked domains
-            if any(blocked in url.lower() for blocked in BLOCKED_DOMAINS):
-                continue
-
-            # Skip if title or body contains non-English text
-            if not self._is_english_content(title) or not self._is_english_content(body):
-                continue
-
-            filtered.append(r)
-        return filtered
-
-    def _search_with_serper(self, search_query: str) -> list:
-        """Use Serper API for Google search results"""
+            kind = self._classify_result(r)
+            if kind == 'trusted':
+                trusted.append(r)
+            elif kind:
+                other.append(r)
+        return trusted, other
+
+    def _search_with_serper(self, search_query: str) -> tuple[list, list]:
+        """Use Serper API for Google search results, split into (trusted, other)"""
         api_key = os.getenv("SERPER_API_KEY")
         if not api_key:
-            return []
+            return [], []
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 "https://google.serper.dev/search",
                 headers={
                     "X-API-KEY": api_key,
@@ -112,24 +286,22 @@ class WebSearchTool(BaseTool):
             )
             data = response.json()
 
-            results = []
-            for item in data.get("organic", []):
-                url = item.get("link", "")
-                # Skip blocked domains
-                if any(blocked in url.lower() for blocked in BLOCKED_DOMAINS):
-                    continue
-                results.append({
+            results = [
+                {
                     "title": item.get("title", ""),
-                    "href": url,
-                    "body": item.get("snippet", "")
-                })
-            return results[:self._max_results]
+                    "href": item.get("link", ""),
+                    "body": item.get("snippet", ""),
+                }
+                for item in data.get("organic", [])[:self._max_results]
+            ]
+            # Blocked domains and non-English results are dropped here
+            return self._classify(results)
         except Exception as e:
             logger.warning(f"Serper API failed: {e}")
-            return []
+            return [], []
 
-    def _search_with_duckduckgo(self, search_query: str) -> list:
-        """Fallback to DuckDuckGo search with English-only results"""
+    def _search_with_duckduckgo(self, search_query: str) -> tuple[list, list]:
+        """Fallback to DuckDuckGo search with English-only results, split into (trusted, other)"""
         try:
             # Try the ddgs package first (new name)
             try:
@@ -147,45 +319,34 @@ class WebSearchTool(BaseTool):
 
             if not results:
                 # Try alternative: direct HTML scraping
-                return self._search_duckduckgo_html(search_query)
+                results = self._search_duckduckgo_html(search_query)
 
             # Filter out blocked domains and non-English content
-            filtered = []
-            for r in results:
-                url = r.get('href', '')
-                title = r.get('title', '')
-                body = r.get('body', '')
-
-                if any(blocked in url.lower() for blocked in BLOCKED_DOMAINS):
-                    continue
-                if not self._is_english_content(title) or not self._is_english_content(body):
-                    continue
-                filtered.append(r)
-            return filtered
+            return self._classify(results)
         except Exception as e:
             logger.warning(f"DuckDuckGo search failed: {e}")
-            return self._search_duckduckgo_html(search_query)
+            return self._classify(self._search_duckduckgo_html(search_query))
 
     def _search_duckduckgo_html(self, search_query: str) -> list:
         """Fallback: scrape DuckDuckGo HTML results"""
         try:
             url = f"https://html.duckduckgo.com/html/?q={requests.utils.quote(search_query)}"
-            response = requests.get(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self._session.get(url, timeout=10)
+            soup = _bs()(response.content, HTML_PARSER)
             results = []
             for result in soup.select('.result')[:self._max_results]:
                 title_el = result.select_one('.result__title a')
                 snippet_el = result.select_one('.result__snippet')
                 if title_el:
-                    href = title_el.get('href', '')
-                    if any(blocked in href.lower() for blocked in BLOCKED_DOMAINS):
+                    # Result links point at DuckDuckGo's redirector; keep the real target
+                    href = _unwrap_redirect(title_el.get('href', ''))
+                    netloc = _netloc(href)
+                    if _domain_matches(netloc, _BLOCKED):
                         continue
                     title = title_el.get_text(strip=True)
                     body = snippet_el.get_text(strip=True) if snippet_el else ''
                     if self._is_english_content(title):
-                        results.append({'title': title, 'href': href, 'body': body})
+                        results.append({'title': title, 'href': href, 'body': body, '_netloc': netloc})
             return results
         except Exception as e:
             logger.warning(f"DuckDuckGo HTML fallback failed: {e}")
@@ -193,82 +354,131 @@ class WebSearchTool(BaseTool):
 
     def _clean_text(self, text: str) -> str:
         """Clean extracted text"""
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
-        noise_patterns = [
-            r'JavaScript is disabled.*?browser\.',
-            r'Please enable JavaScript.*?proceed\.',
-            r'A required part.*?different browser\.',
-            r'Client Challenge',
-            r'Loading\.\.\.',
-            r'Sign in.*?account',
-            r'Create.*?account',
-            r'Advertisement',
-            r'Skip to.*?content',
-        ]
-        for pattern in noise_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.DOTALL)
+        text = NOISE_PATTERNS.sub('', text)
+        text = _WHITESPACE_RE.sub(lambda m: '\n\n' if m.group().startswith('\n') else ' ', text)
         return text.strip()
 
-    def _extract_wiki_content(self, soup: BeautifulSoup, url: str) -> str:
+    def _first_matches(self, soup: 'BeautifulSoup', selectors: tuple[str, ...]) -> list:
+        """Same as [soup.select_one(s) for s in selectors] (misses dropped), from one tree walk"""
+        candidates = soup.select(', '.join(selectors))
+        found = []
+        for selector in selectors:
+            match = next((c for c in candidates if c.css.match(selector)), None)
+            if match is not None:
+                found.append(match)
+        return found
+
+    def _join_text(self, elements: list, min_length: int = 0) -> str:
+        """Newline-join the stripped text of elements longer than min_length"""
+        texts = (el.get_text(strip=True) for el in elements)
+        return '\n'.join(t for t in texts if len(t) > min_length)
+
+    def _container_text(self, soup: 'BeautifulSoup', selectors: tuple[str, ...], tags: tuple[str, ...]) -> str:
+        """Text of the first container (in selector priority order) holding over 200 chars"""
+        content = ""
+        for main_content in self._first_matches(soup, selectors):
+            content = self._join_text(main_content.find_all(tags))
+            if len(content) > 200:
+                break
+        return content
+
+    def _extract_wiki_content(self, soup: 'BeautifulSoup', url: str) -> str:
         """Extract content with wiki-specific selectors"""
         content = ""
+        netloc = _netloc(url)
+        site = next((s for s in SITE_EXTRACTORS if _domain_matches(netloc, s[0])), None)
+        _, selectors, tags, clutter = site or (None, (), (), '')
 
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside',
-                            'iframe', 'noscript']):
+        # Page chrome (plus the site's in-article clutter) goes in one pass
+        for element in soup.select(f"{STRIP_SELECTOR}, {clutter}" if clutter else STRIP_SELECTOR):
             element.decompose()
 
-        if "fandom.com" in url or "wikia.com" in url:
-            for selector in ['.mw-parser-output', '#mw-content-text', '.page-content', 'article']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    for unwanted in main_content.select('.portable-infobox, .navbox, .toc, .mbox, .infobox'):
-                        unwanted.decompose()
-                    paragraphs = main_content.find_all(['p', 'li', 'h2', 'h3'])
-                    content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    if len(content) > 200:
-                        break
-
-        elif "fextralife.com" in url:
-            for selector in ['#wiki-content-block', '.wiki-content', 'article', '.col-sm-12']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    paragraphs = main_content.find_all(['p', 'li', 'h2', 'h3', 'td'])
-                    content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    if len(content) > 200:
-                        break
-
-        elif "ign.com" in url:
-            for selector in ['article', '.article-content', '.wiki-page', '.guide-content']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    paragraphs = main_content.find_all(['p', 'li', 'h2', 'h3'])
-                    content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    if len(content) > 200:
-                        break
+        if selectors:
+            content = self._container_text(soup, selectors, tags)
 
         if not content or len(content) < 200:
-            for selector in ['article', 'main', '.content', '#content', '.post-content']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    paragraphs = main_content.find_all(['p', 'li', 'h2', 'h3'])
-                    content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    if len(content) > 200:
-                        break
+            content = self._container_text(soup, GENERIC_SELECTORS, ('p', 'li', 'h2', 'h3'))
 
             if not content or len(content) < 200:
                 body = soup.find('body')
                 if body:
-                    paragraphs = body.find_all(['p', 'li'])
-                    content = '\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50])
+                    content = self._join_text(body.find_all(['p', 'li']), min_length=50)
 
         return self._clean_text(content)[:self._max_content_length]
 
+    def _search_query(self, search_query: str) -> list[tuple[list, list]]:
+        """Search one query: Serper (Google results) first, DuckDuckGo if no trusted hit"""
+        batches = []
+        trusted, other = self._search_with_serper(search_query)
+        if trusted or other:
+            batches.append((trusted, other))
+            if trusted:
+                return batches
+
+        # Try DuckDuckGo as fallback
+        trusted, other = self._search_with_duckduckgo(search_query)
+        if trusted or other:
+            batches.append((trusted, other))
+        return batches
+
+    def _fetch_page(self, url: str, max_bytes: int | None = None) -> tuple[bytes | None, bool]:
+        """Download a page, stopping after max_bytes; returns (html or None if not 200, truncated)"""
+        with self._session.get(url, timeout=self._timeout, stream=True) as response:
+            if response.status_code != 200:
+                return None, False
+            buf = bytearray()
+            for chunk in response.iter_content(16384):
+                buf.extend(chunk)
+                if max_bytes is not None and len(buf) >= max_bytes:
+                    return bytes(buf), True
+            return bytes(buf), False
+
+    def _fetch_result(self, result: dict) -> dict | None:
+        """Fetch a result's page and return it with extracted content (None to drop it)"""
+        url = result['href']
+        title = result['title']
+        snippet = result['body']
+
+        content = snippet
+        try:
+            html, truncated = self._fetch_page(url, FETCH_MAX_BYTES)
+            if html is not None:
+                extracted = self._extract_wiki_content(_bs()(html, HTML_PARSER), url)
+                if len(extracted) <= 200 and truncated:
+                    # Article body starts past the first read; fetch the whole page
+                    html, _ = self._fetch_page(url)
+                    if html is not None:
+                        extracted = self._extract_wiki_content(_bs()(html, HTML_PARSER), url)
+                # Only use extracted content if it's in English
+                if len(extracted) > 200 and self._is_english_content(extracted):
+                    content = extracted
+                elif not self._is_english_content(extracted):
+                    logger.warning(f"Skipping non-English content from {url}")
+                    # Keep snippet if extraction failed/rejected but snippet is okay
+                    if not self._is_english_content(snippet):
+                        return None
+        except Exception as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+
+        if len(content) > 50 and self._is_english_content(content):
+            return {
+                "title": title,
+                "href": url,
+                "content": content
+            }
+        return None
+
     def search(self, game_name: str, query: str) -> list[dict]:
         """
         Perform the web search and return raw results suitable for indexing.
         Returns a list of dicts with keys: 'title', 'href', 'content'.
         """
+        cache_key = (game_name.lower(), query.lower())
+        cached = _get_cached_search(cache_key)
+        if cached is not None:
+            logger.info(f"Reusing web search results for '{game_name} {query}'")
+            return cached
+
         try:
             # Build search queries - prioritize game-specific wikis first
             game_lower = game_name.lower().replace(' ', '')
@@ -281,100 +491,57 @@ class WebSearchTool(BaseTool):
             ]
 
             # Add game-specific fandom site if known
-            if "hollow" in game_lower:
-                search_queries.insert(0, f"site:hollowknight.fandom.com {query}")
-            elif "elden" in game_lower:
-                search_queries.insert(0, f"site:eldenring.wiki.fextralife.com {query}")
-            elif "dark souls" in game_lower or "darksouls" in game_lower:
-                search_queries.insert(0, f"site:darksouls.fandom.com {query}")
+            known_game = _GAME_SITE_RE.search(game_lower)
+            if known_game:
+                search_queries.insert(0, f"{GAME_SITE_QUERIES[known_game.group()]} {query}")
 
             all_results = []
 
-            # Try each search query
-            for sq in search_queries:
-                # Try Serper first (Google results)
-                results = self._search_with_serper(sq)
-                if results:
-                    # Filter to English content only
-                    filtered = [r for r in results if self._is_english_content(r.get('title', '')) and self._is_english_content(r.get('body', ''))]
-                    # Prioritize trusted wikis but don't exclude others
-                    trusted = [r for r in filtered if self._is_english_site(r['href'])]
-                    other = [r for r in filtered if not self._is_english_site(r['href']) and not any(blocked in r['href'].lower() for blocked in BLOCKED_DOMAINS)]
+            def take(batches) -> bool:
+                """Add one query's results; True once a trusted result is in"""
+                for trusted, other in batches:
                     all_results.extend(trusted)
                     all_results.extend(other[:2])  # Add a few non-wiki results too
-                    if trusted:
-                        break
-
-                # Try DuckDuckGo as fallback
-                results = self._search_with_duckduckgo(sq)
-                if results:
-                    # Filter to English content only
-                    filtered = [r for r in results if self._is_english_content(r.get('title', '')) and self._is_english_content(r.get('body', ''))]
-                    trusted = [r for r in filtered if self._is_english_site(r['href'])]
-                    other = [r for r in filtered if not self._is_english_site(r['href']) and not any(blocked in r['href'].lower() for blocked in BLOCKED_DOMAINS)]
-                    all_results.extend(trusted)
-                    all_results.extend(other[:2])
-                    if trusted:
-                        break
+                return bool(batches and batches[-1][0])
+
+            # The top query usually finds a trusted wiki on its own, so it runs
+            # alone: Serper is a metered API and DuckDuckGo rate-limits bursts.
+            # On a miss the rest are taken in priority order with one query of
+            # lookahead: the next query runs while we wait on the current one,
+            # and nothing further is started once a trusted result is in.
+            if not take(self._search_query(search_queries[0])):
+                rest = search_queries[1:]
+                executor = ThreadPoolExecutor(max_workers=2)
+                try:
+                    futures = [executor.submit(self._search_query, q) for q in rest[:2]]
+                    for i, future in enumerate(futures):
+                        if take(future.result()):
+                            break
+                        if i + 2 < len(rest):
+                            futures.append(executor.submit(self._search_query, rest[i + 2]))
+                finally:
+                    # Don't wait on the lookahead query once a trusted result is in
+                    executor.shutdown(wait=False)
 
             # If still no results, try a broader search without site restrictions
             if not all_results:
                 broad_query = f"{game_name} {query} english wiki guide"
-                results = self._search_with_duckduckgo(broad_query)
-                if results:
-                    filtered = [r for r in results if self._is_english_content(r.get('title', '')) and self._is_english_content(r.get('body', ''))]
-                    all_results.extend(filtered[:5])
+                trusted, other = self._search_with_duckduckgo(broad_query)
+                all_results.extend((trusted + other)[:5])
 
             if not all_results:
                 return []
 
-            # Deduplicate
-            seen_urls = set()
-            unique_results = []
-            for r in all_results:
-                if r['href'] not in seen_urls:
-                    seen_urls.add(r['href'])
-                    unique_results.append(r)
-
-            # Fetch and format results
-            processed_results = []
-            for result in unique_results[:3]:
-                url = result['href']
-                title = result['title']
-                snippet = result['body']
-
-                content = snippet
-                try:
-                    response = requests.get(
-                        url,
-                        timeout=self._timeout,
-                        headers={
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                            'Accept-Language': 'en-US,en;q=0.9',
-                        }
-                    )
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        extracted = self._extract_wiki_content(soup, url)
-                        # Only use extracted content if it's in English
-                        if len(extracted) > 200 and self._is_english_content(extracted):
-                            content = extracted
-                        elif not self._is_english_content(extracted):
-                            logger.warning(f"Skipping non-English content from {url}")
-                            # Keep snippet if extraction failed/rejected but snippet is okay
-                            if not self._is_english_content(snippet):
-                                continue
-                except Exception as e:
-                    logger.warning(f"Failed to fetch {url}: {e}")
-
-                if len(content) > 50 and self._is_english_content(content):
-                    processed_results.append({
-                        "title": title,
-                        "href": url,
-                        "content": content
-                    })
-
-            return processed_results
+            # Deduplicate by URL, keeping each URL's first (highest-priority) result
+            first_by_url = {r['href']: r for r in reversed(all_results)}
+            unique_results = [first_by_url[url] for url in dict.fromkeys(r['href'] for r in all_results)]
+
+            # Fetch and format the top results in parallel (map keeps their order)
+            top_results = unique_results[:3]
+            with ThreadPoolExecutor(max_workers=len(top_results)) as executor:
+                processed_results = [r for r in executor.map(self._fetch_result, top_results) if r]
+
+            return _cache_search(cache_key, processed_results)
 
         except Exception as e:
             logger.error(f"Web search error: {e}")
@@ -1,8 +1,10 @@
 
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 import os
 import sys
+import tempfile
+import time
 
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
@@ -19,6 +21,8 @@ class TestSystemValidation(unittest.TestCase):
         os.environ["CHROMA_DB_PATH"] = "./tests/chroma_db_validation"
         os.environ["GEMINI_API_KEY"] = "fake_key_for_validation" # We mock the calls mostly
         os.environ["GOOGLE_API_KEY"] = "fake_key_for_validation"
+        # Web searches are mocked; don't let the persistent web cache answer them
+        os.environ["WEBSEARCH_CACHE_TTL"] = "0"
 
     def test_01_tool_registration(self):
         """Verify tools are correctly registered and args_schema works"""
@@ -64,7 +68,7 @@ class TestSystemValidation(unittest.TestCase):
         self.assertTrue(crew_gemini._llm.model.startswith("gemini"))
 
     @patch('rpgagents.tools.web_search_tool.WebSearchTool.search') 
-    @patch('rpgagents.tools.game_search_tool.GameSearchTool.index_documents')
+    @patch('rpgagents.tools.game_search_tool.GameSearchTool._index_documents', return_value=("Indexed 0 chunks", None))
     def test_05_rag_pipeline_integration(self, mock_index, mock_web_search):
         """Verify GameSearchTool falls back to WebSearchTool correctly"""
         
@@ -74,10 +78,9 @@ class TestSystemValidation(unittest.TestCase):
         ]
         
         tool = GameSearchTool()
-        # Mock internal ChromaDB client to return empty collection list to trigger fallback
-        tool._chroma_client.list_collections = MagicMock(return_value=[])
-             
-        result = tool._run("New Game", "What is the answer?")
+        # Report no local collection for the game to trigger the web fallback
+        with patch.object(GameSearchTool, '_has_collection', return_value=False):
+            result = tool._run("New Game", "What is the answer?")
              
         # Assert web search was called with ORIGINAL game name (not normalized)
         mock_web_search.assert_called_with("New Game", "What is the answer?")
@@ -85,6 +88,65 @@ class TestSystemValidation(unittest.TestCase):
         # Assert indexing was called
         mock_index.assert_called()
 
+    def test_06_document_chunking(self):
+        """Verify documents split on natural boundaries within the chunk size"""
+        from rpgagents.tools.game_search_tool import _chunk
+
+        text = "One. Two two. Three three three.\nFour. " + "x" * 90
+        chunks = _chunk(text, size=30, overlap=12)
+
+        self.assertTrue(all(len(c) <= 30 for c in chunks))
+        self.assertEqual(chunks[:2], ["One. Two two.", "Two two. Three three three."])
+        # Over-long segments are cut into windows overlapping by 12 chars
+        self.assertEqual(chunks[2:], ["Four."] + ["x" * 30] * 4 + ["x" * 18])
+        self.assertEqual(_chunk(""), [])
+
+        # Chunks are stripped and blank segments dropped
+        self.assertEqual(_chunk(" "), [])
+        self.assertEqual(_chunk("Boss guide.\n   \nPhase two", size=12, overlap=3), ["Boss guide.", "Phase two"])
+        self.assertEqual(_chunk("   \n  Indented line.", size=30, overlap=5), ["Indented line."])
+
+        # Long runs of words are cut at whitespace, never mid-word
+        words = "The quick brown fox jumps over the lazy dog and keeps running far away"
+        self.assertEqual(_chunk(words, size=20, overlap=8), [
+            "The quick brown fox", "fox jumps over the", "over the lazy dog",
+            "lazy dog and keeps", "keeps running far", "far away",
+        ])
+
+
+    def test_07_web_search_cache(self):
+        """Verify the persistent web cache round-trips, expires, evicts and can be disabled"""
+        from rpgagents.tools.web_cache import WebSearchCache
+
+        results = [{"title": "Page", "href": "http://test.com", "content": "x" * 100}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "web.sqlite3")
+
+            cache = WebSearchCache(path=path, ttl=60)
+            cache.put("new_game", "query", results)
+            self.assertEqual(cache.get("new_game", "query"), results)
+            self.assertIsNone(cache.get("new_game", "other query"))
+
+            # Rows older than the TTL are misses
+            with patch("rpgagents.tools.web_cache.time.time", return_value=time.time() + 120):
+                self.assertIsNone(cache.get("new_game", "query"))
+
+            # Past max_bytes the oldest rows are evicted first
+            small = WebSearchCache(path=path, ttl=60, max_bytes=400)
+            with patch("rpgagents.tools.web_cache.time.time", return_value=time.time() + 1):
+                small.put("new_game", "second", results)
+            with patch("rpgagents.tools.web_cache.time.time", return_value=time.time() + 2):
+                small.put("new_game", "third", results)
+            self.assertIsNone(small.get("new_game", "query"))
+            self.assertEqual(small.get("new_game", "second"), results)
+            self.assertEqual(small.get("new_game", "third"), results)
+
+            # ttl=0 turns the cache off entirely
+            disabled = WebSearchCache(path=os.path.join(tmp, "off.sqlite3"), ttl=0)
+            disabled.put("new_game", "query", results)
+            self.assertIsNone(disabled.get("new_game", "query"))
+            self.assertFalse(os.path.exists(os.path.join(tmp, "off.sqlite3")))
+
 
 if __name__ == '__main__':
     print("🚀 Starting End-to-End System Validation...")